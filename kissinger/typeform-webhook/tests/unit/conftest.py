@@ -0,0 +1,145 @@
+import os
+import sys
+import types
+
+import botocore.session
+import pytest
+
+HANDLER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "webhook-handler")
+
+PARAMETERS = {
+    "typeformSecret": "test-secret",
+    "slackWebhookUrl": "https://hooks.slack.test/webhook",
+}
+
+os.environ.setdefault("QUEUE_URL", "https://sqs.test/queue")
+os.environ.setdefault("STORY_TABLE", "test-story-table")
+os.environ.setdefault("USER_POOL_ID", "test-user-pool")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+
+class UserNotFoundException(Exception):
+    pass
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class FakeClient:
+    """ Records every call and answers it from the handler registered for the operation """
+
+    exceptions = types.SimpleNamespace(
+        UserNotFoundException=UserNotFoundException,
+        ConditionalCheckFailedException=ConditionalCheckFailedException,
+    )
+
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.calls = []
+
+    def __getattr__(self, operation):
+        def call(**kwargs):
+            self.calls.append((operation, kwargs))
+            handler = self.handlers.get(operation)
+            return handler(**kwargs) if handler else {}
+
+        return call
+
+
+def fake_clients():
+    return {
+        "ssm": FakeClient(get_parameter=lambda Name, **_: {"Parameter": {"Value": PARAMETERS[Name]}}),
+        "cognito-idp": FakeClient(admin_get_user=lambda **_: {
+            "UserAttributes": [
+                {"Name": "given_name", "Value": "Ann"},
+                {"Name": "family_name", "Value": "Lee"},
+            ]
+        }),
+        "dynamodb": FakeClient(query=lambda **_: {"Items": []}),
+        "sqs": FakeClient(),
+    }
+
+
+class FakeSession:
+    """ Stands in for the botocore session so importing the handler never reaches AWS """
+
+    def __init__(self):
+        self.clients = fake_clients()
+
+    def create_client(self, service_name, config=None):
+        return self.clients[service_name]
+
+
+@pytest.fixture(scope="session")
+def app():
+    """ Imports the handler module with botocore patched out """
+    sys.path.insert(0, HANDLER_DIR)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(botocore.session, "get_session", FakeSession)
+        import app as handler
+    return handler
+
+
+@pytest.fixture()
+def aws(app, monkeypatch):
+    """ Fresh stubbed clients per test, with no parameters cached from earlier tests """
+    clients = fake_clients()
+    monkeypatch.setattr(app, "get_client", clients.__getitem__)
+    app.parameter_futures.clear()
+    app.get_webhook_secret.cache_clear()
+    return clients
+
+
+@pytest.fixture()
+def slack_posts(app, monkeypatch):
+    """ Captures Slack posts instead of sending them """
+    posts = []
+
+    def post(url, **kwargs):
+        posts.append((url, kwargs))
+        return types.SimpleNamespace(status_code=200)
+
+    monkeypatch.setattr(app.slack_session, "post", post)
+    return posts
+
+
+@pytest.fixture()
+def webhook_secret():
+    return PARAMETERS["typeformSecret"]
+
+
+@pytest.fixture()
+def lambda_context():
+    return types.SimpleNamespace(
+        aws_request_id="c6af9ac6-7b61-11e6-9a41-93e8deadbeef",
+        function_name="sf-test-typeform-webhook",
+        memory_limit_in_mb=128,
+        invoked_function_arn="arn:aws:lambda:us-east-1:123456789012:function:sf-test-typeform-webhook",
+        function_version="$LATEST",
+    )
+
+
+@pytest.fixture()
+def form_response():
+    """ Generates a typeform response with a birthdate and gender answered """
+
+    return {
+        "event_type": "form_response",
+        "form_response": {
+            "form_id": "cmEwHxtl",
+            "token": "01H3MV1515PKNFM8D5D3HRS7C3",
+            "hidden": {"user_id": "test-user"},
+            "definition": {
+                "fields": [
+                    {"id": "VYsICm8rAEYx", "title": "What's your birthday?"},
+                    {"id": "7NgJc6n3fYKa", "title": "What's your gender?"},
+                ]
+            },
+            "answers": [
+                {"type": "date", "date": "1990-06-15", "field": {"id": "VYsICm8rAEYx", "type": "date"}},
+                {"type": "choice", "choice": {"label": "Female"}, "field": {"id": "7NgJc6n3fYKa", "type": "multiple_choice"}},
+            ],
+        },
+    }
+
@@ -0,0 +1,97 @@
+import pytest
+
+BIRTHDATE_ID = "VYsICm8rAEYx"
+GENDER_ID = "7NgJc6n3fYKa"
+OTHER_EQUIPMENT_ID = "F0T49AYX7sf2"
+
+
+def answer(question_id, answer_type, value):
+    return {"type": answer_type, answer_type: value, "field": {"id": question_id, "type": "short_text"}}
+
+
+def test_unanswered_question_in_form_defaults_to_empty(app):
+    answers = app.extract_answers({OTHER_EQUIPMENT_ID}, [])
+
+    assert answers["other_equipment"] == ""
+
+
+def test_question_missing_from_form_defaults_to_not_provided(app):
+    answers = app.extract_answers(set(), [])
+
+    assert answers["other_equipment"] == "Not provided"
+    assert set(answers) == set(app.FIELD_IDS)
+
+
+def test_answered_question_uses_answer_value(app):
+    answers = app.extract_answers(
+        {BIRTHDATE_ID, GENDER_ID},
+        [
+            answer(BIRTHDATE_ID, "date", "1990-06-15"),
+            answer(GENDER_ID, "choice", {"label": "Female"}),
+        ],
+    )
+
+    assert answers["birthdate"] == "1990-06-15"
+    assert answers["gender"] == "Female"
+
+
+def test_answer_for_question_missing_from_form_is_ignored(app):
+    answers = app.extract_answers(set(), [answer(GENDER_ID, "choice", {"label": "Female"})])
+
+    assert answers["gender"] == "Not provided"
+
+
+def test_answers_for_other_questions_are_ignored(app):
+    answers = app.extract_answers({"4Eu8qVqiOce3"}, [answer("4Eu8qVqiOce3", "text", "Ann")])
+
+    assert "Ann" not in answers.values()
+
+
+def test_skipped_other_equipment_is_left_out_of_the_prompt(app):
+    answers = app.extract_answers(
+        {OTHER_EQUIPMENT_ID}, [answer("9CnfCXmUgSXo", "text", "Kettlebells")])
+
+    detail = app.format_environment_detail(
+        "Ann", "Home", answers["gym_name"], "Kettlebells", answers["other_equipment"])
+
+    assert detail == "4. Environment: Ann trains at home with access to Kettlebells. "
+
+
+@pytest.mark.parametrize(
+    "answer_type, value, expected",
+    [
+        ("text", "5'10", "5'10"),
+        ("email", "ann@example.com", "ann@example.com"),
+        ("phone_number", "+15555550100", "+15555550100"),
+        ("date", "1990-06-15", "1990-06-15"),
+        ("choice", {"label": "Female"}, "Female"),
+        ("choices", {"labels": ["Strength", "Endurance"]}, "Strength, Endurance"),
+        ("choices", {"labels": [], "other": "Climbing"}, "Climbing"),
+        ("number", 180, 180),
+        ("boolean", False, False),
+        ("file", {"url": "https://files.test/a.png"}, "https://files.test/a.png"),
+        ("payment", {"successful": True}, "True"),
+        ("url", "https://example.com", "https://example.com"),
+    ],
+)
+def test_answer_extractors(app, answer_type, value, expected):
+    assert app.get_answer_value(answer("q", answer_type, value)) == expected
+
+
+def test_extractors_cover_every_answer_type(app):
+    assert list(app.ANSWER_EXTRACTORS) == [
+        "text", "email", "phone_number", "date", "choice", "choices",
+        "number", "boolean", "file", "payment", "url"]
+
+
+def test_answer_without_type_falls_back_to_key_order(app):
+    assert app.get_answer_value({"email": "ann@example.com", "url": "https://example.com"}) == "ann@example.com"
+
+
+def test_answer_whose_type_has_no_value_key_falls_back(app):
+    assert app.get_answer_value({"type": "file_url", "url": "https://example.com"}) == "https://example.com"
+
+
+def test_unsupported_answer_type(app):
+    assert app.get_answer_value({"type": "file_url", "file_url": "https://files.test/a.png"}) == \
+        "Answer type not supported"
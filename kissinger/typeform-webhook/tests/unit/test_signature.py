@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import hmac
+import json
+
+
+def sign(body, secret):
+    digest = hmac.new(secret.encode("utf-8"), body.encode("utf-8"), hashlib.sha256).digest()
+    return "sha256=" + base64.b64encode(digest).decode()
+
+
+def webhook_event(body, signature):
+    return {"body": body, "headers": {"Typeform-Signature": signature}}
+
+
+def test_valid_signature_processes_the_response(app, aws, slack_posts, lambda_context, form_response, webhook_secret):
+    body = json.dumps(form_response)
+
+    ret = app.lambda_handler(webhook_event(body, sign(body, webhook_secret)), lambda_context)
+
+    assert ret["statusCode"] == 200
+    assert [operation for operation, _ in aws["cognito-idp"].calls] == [
+        "admin_get_user", "admin_update_user_attributes"]
+    assert [operation for operation, _ in aws["sqs"].calls] == ["send_message"]
+
+
+def test_bad_signature_is_rejected(app, aws, slack_posts, lambda_context, form_response):
+    body = json.dumps(form_response)
+
+    ret = app.lambda_handler(webhook_event(body, sign(body, secret="wrong-secret")), lambda_context)
+
+    assert ret["statusCode"] == 403
+    assert json.loads(ret["body"])["detail"] == "Invalid signature. Permission Denied."
+    assert aws["cognito-idp"].calls == []
+
+
+def test_tampered_body_is_rejected(app, aws, slack_posts, lambda_context, form_response, webhook_secret):
+    signature = sign(json.dumps(form_response), webhook_secret)
+    form_response["form_response"]["hidden"]["user_id"] = "someone-else"
+
+    ret = app.lambda_handler(webhook_event(json.dumps(form_response), signature), lambda_context)
+
+    assert ret["statusCode"] == 403
+    assert aws["cognito-idp"].calls == []
+
+
+def test_signature_that_is_not_base64_is_rejected(app, aws, slack_posts, lambda_context, form_response):
+    ret = app.lambda_handler(webhook_event(json.dumps(form_response), "sha256=not*base64!"), lambda_context)
+
+    assert ret["statusCode"] == 403
+    assert json.loads(ret["body"])["detail"] == "Invalid signature. Permission Denied."
+    assert aws["cognito-idp"].calls == []
+
+
+def test_missing_signature_is_rejected(app, aws, slack_posts, lambda_context, form_response):
+    event = {"body": json.dumps(form_response), "headers": {}}
+
+    ret = app.lambda_handler(event, lambda_context)
+
+    assert ret["statusCode"] == 403
+    assert aws["cognito-idp"].calls == []
+
+
+def test_unsupported_sha_is_rejected(app, aws, slack_posts, lambda_context, form_response):
+    body = json.dumps(form_response)
+    signature = "sha1=" + base64.b64encode(b"0" * 20).decode()
+
+    ret = app.lambda_handler(webhook_event(body, signature), lambda_context)
+
+    assert ret["statusCode"] == 403
+    assert json.loads(ret["body"])["detail"] == "Operation not supported."
+
+
+def test_rejections_send_one_slack_alert(app, aws, slack_posts, lambda_context, form_response):
+    app.lambda_handler(webhook_event(json.dumps(form_response), "sha256=not*base64!"), lambda_context)
+
+    assert len(slack_posts) == 1
+    assert slack_posts[0][0] == "https://hooks.slack.test/webhook"
@@ -1,32 +1,98 @@
-import hashlib
 import hmac
 import json
 import base64
-import boto3
 import requests
-import uuid
+import botocore.session
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
 import os
 import re
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timezone
+from functools import lru_cache
 
 from aws_lambda_powertools import Logger
 
 logger = Logger()
 
-cognito = boto3.client('cognito-idp')
-ssm = boto3.client('ssm')
-dynamodb = boto3.client('dynamodb')
-sqs = boto3.client('sqs')
+# Keep connections alive between calls. Retries and timeouts are budgeted against the 10s function
+# timeout: one hung call gives up after 2 attempts x (1s connect + 2s read) plus backoff, leaving
+# time for lambda_handler to send its error alert before Lambda kills the invocation.
+client_config = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 2},
+    connect_timeout=1,
+    read_timeout=2,
+    max_pool_connections=10
+)
+
+# Clients come straight from botocore and are created on first use (see get_client),
+# so requests rejected before reaching DynamoDB or SQS never build those clients
+session = botocore.session.get_session()
+clients = {}
+clients_lock = threading.Lock()
+
+# Worker threads for overlapping independent network calls within an invocation
+executor = ThreadPoolExecutor(max_workers=4)
+
+# hmac.digest only takes the OpenSSL one-shot path (SHA extensions where the CPU has them)
+# when hashlib is backed by OpenSSL; otherwise it falls back to the pure-Python HMAC loop.
+try:
+    import _hashlib  # noqa: F401
+except ImportError:
+    logger.warning('hashlib is not backed by OpenSSL; webhook signature checks will be slower.')
 
 QUEUE_URL = os.environ['QUEUE_URL']
 STORY_TABLE = os.environ['STORY_TABLE']
 USER_POOL_ID = os.environ['USER_POOL_ID']
 
+# (connect, read) seconds for one Slack post. Posts are not retried, so the drain below covers
+# a post's whole budget and nothing is left in flight when the container freezes.
+SLACK_REQUEST_TIMEOUT = (0.5, 1.5)
+
+# Seconds to wait for background Slack posts before the handler returns
+SLACK_DRAIN_TIMEOUT = sum(SLACK_REQUEST_TIMEOUT)
+
+# Reused across invocations so warm containers keep the TLS connection to Slack open
+slack_session = requests.Session()
+slack_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4  # one per executor worker
+))
+
+# Slack posts submitted during the current invocation
+pending_slack_posts = []
+
+# SSM parameter fetches by name
+parameter_futures = {}
+parameter_lock = threading.Lock()
+
+# Errors logged during the current invocation, sent to Slack as one message when it ends
+pending_errors = []
+
 
 @logger.inject_lambda_context
 def lambda_handler(event, context):
     logger.append_keys(awsRequestId=context.aws_request_id)
+    try:
+        return handle_webhook(event)
+    except Exception as e:
+        log_and_alert("Unhandled error while processing webhook", e)
+        raise e
+    finally:
+        send_errors_to_slack()
+        # Lambda freezes the container once we return, so let in-flight Slack posts finish first
+        drain_slack_posts()
+
+
+def handle_webhook(event):
+    # One clock read per invocation, shared by the age calculation and every stored timestamp
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
     raw_body = event["body"]
+    # Encode once; the signature check and the JSON parse both work on these bytes
+    raw_body_bytes = raw_body.encode('utf-8') if isinstance(raw_body, str) else raw_body
     received_signature = event["headers"].get("Typeform-Signature")
 
     if not received_signature:
@@ -45,7 +111,13 @@ def lambda_handler(event, context):
             "body": json.dumps({"detail": "Operation not supported."})
         }
 
-    is_valid = verify_signature(signature, raw_body)
+    try:
+        received_digest = base64.b64decode(signature, validate=True)
+    except ValueError:
+        received_digest = None
+
+    is_valid = received_digest is not None and verify_signature(
+        received_digest, raw_body_bytes)
 
     if not is_valid:
         log_and_alert("Webhook signature is invalid. Permission denied.")
@@ -54,7 +126,7 @@ def lambda_handler(event, context):
             "body": json.dumps({"detail": "Invalid signature. Permission Denied."})
         }
 
-    body = json.loads(raw_body)
+    body = json.loads(raw_body_bytes)
     form_id = body["form_response"]["form_id"]
     token = body["form_response"]["token"]
     user_id = body['form_response']['hidden']['user_id']
@@ -64,7 +136,7 @@ def lambda_handler(event, context):
     logger.info(f"Getting user info for {user_id}")
     try:
         cognito_user = get_cognito_user(user_id)
-    except cognito.exceptions.UserNotFoundException:
+    except get_client('cognito-idp').exceptions.UserNotFoundException:
         log_and_alert(
             f"Failed to get user from cognito: User {user_id} not found.")
         return {"statusCode": 200, "body": json.dumps({"detail": "User not found."})}
@@ -80,7 +152,8 @@ def lambda_handler(event, context):
     # Mark the user as having completed the typeform
     update_args = {
         'typeformFormId': form_id,
-        'typeformResponseToken': token
+        'typeformResponseToken': token,
+        'trialStartDate': now_iso
     }
     logger.info(f"Updating user {user_id} with typeformIds.")
     try:
@@ -96,76 +169,18 @@ def lambda_handler(event, context):
 
     form_answers = body["form_response"]["answers"]
 
-    question_id_to_title = get_question_id_to_title(form_definition)
-
-    question_id_to_answer = map_question_id_to_answer(form_answers)
-
-    question_answer_pairs = {}
-    for key, value in question_id_to_title.items():
-        question_answer_pairs[key] = {
-            "title": value, "answer": question_id_to_answer.get(key, "")}
-
-    birthdate = safe_get_answer(question_answer_pairs, "VYsICm8rAEYx")
-    age = calculate_age(birthdate)
-    height = safe_get_answer(question_answer_pairs, "Ie0vINxRmbiE")
-    weight = safe_get_answer(question_answer_pairs, "U00Hv7HSJJE1")
-    gender = safe_get_answer(question_answer_pairs, "7NgJc6n3fYKa")
-    fitness_goals = safe_get_answer(question_answer_pairs, "EKEiaNAbhs9B")
-    fitness_level = safe_get_answer(question_answer_pairs, "dN0leyRXTKwb")
-    exercise_frequency = safe_get_answer(question_answer_pairs, "v3luF8GH8oTn")
-    workout_duration = safe_get_answer(question_answer_pairs, "4qftExcBXdrX")
-    weightlifting_duration = safe_get_answer(
-        question_answer_pairs, "wORIrsd4ZVLR")
-    number_of_exercises = safe_get_answer(
-        question_answer_pairs, "nY5mGGjAbXgZ")
-    sets_reps = safe_get_answer(question_answer_pairs, "VYFQXGfIQyAy")
-    sets_reps_custom = safe_get_answer(question_answer_pairs, "hLOuuzKYATVt")
-    workout_location = safe_get_answer(question_answer_pairs, "umri0ewHbWux")
-    gym_name = safe_get_answer(question_answer_pairs, "fStabAHHt7Hw")
-    available_equipment = safe_get_answer(
-        question_answer_pairs, "9CnfCXmUgSXo")
-    other_equipment = safe_get_answer(question_answer_pairs, "F0T49AYX7sf2")
-    current_cardio = safe_get_answer(question_answer_pairs, "zYfBaTZMNkFI")
-    include_cardio = safe_get_answer(question_answer_pairs, "lKUgraPL2qDa")
-    cardio_frequency = safe_get_answer(question_answer_pairs, "ZRYPo085Loaz")
-    cardio_length = safe_get_answer(question_answer_pairs, "L5vTS0xxncEz")
-    preferred_cardio_types = safe_get_answer(
-        question_answer_pairs, "qu9e790LtDZh")
-    physical_injuries = safe_get_answer(question_answer_pairs, "zp6cr5EGryS5")
-    injury_details = safe_get_answer(question_answer_pairs, "TDFLXROBWg4r")
-
-    prompt = generate_prompt(
-        first_name,
-        last_name,
-        age,
-        gender,
-        fitness_level,
-        height,
-        weight,
-        fitness_goals,
-        exercise_frequency,
-        workout_duration,
-        weightlifting_duration,
-        number_of_exercises,
-        sets_reps,
-        sets_reps_custom,
-        workout_location,
-        available_equipment,
-        current_cardio,
-        include_cardio,
-        cardio_frequency,
-        cardio_length,
-        preferred_cardio_types,
-        gym_name,
-        other_equipment,
-        physical_injuries,
-        injury_details
-    )
+    question_ids = get_question_ids(form_definition)
+
+    answers = extract_answers(question_ids, form_answers)
+
+    age = calculate_age(answers.pop("birthdate"), now.date())
+
+    prompt = generate_prompt(first_name, last_name, age, **answers)
 
     prompt = remove_emojis(prompt)
     send_to_slack(prompt)
     try:
-        save_to_db(user_id, prompt)
+        save_to_db(user_id, prompt, now_iso)
     except Exception as e:
         log_and_alert("Unable to save user story to db", e)
         return {
@@ -174,8 +189,8 @@ def lambda_handler(event, context):
         }
 
     try:
-        sqs.send_message(MessageBody=json.dumps({"userId": user_id, "event": "typeform.processed"}),
-                         QueueUrl=QUEUE_URL)
+        get_client('sqs').send_message(MessageBody=json.dumps({"userId": user_id, "event": "typeform.processed"}),
+                                       QueueUrl=QUEUE_URL)
     except Exception as e:
         log_and_alert(
             f"Unable to send initiate generate workout flow for user {user_id}", e)
@@ -187,11 +202,19 @@ def lambda_handler(event, context):
 
 def log_and_alert(message, error=None):
     logger.error(message, exc_info=error)
-    send_error_to_slack(f"{message}. Error: {error}")
+    pending_errors.append(f"{message}. Error: {error}")
+
+
+def get_client(service_name):
+    # botocore sessions are not thread-safe, so client creation is serialized
+    with clients_lock:
+        if service_name not in clients:
+            clients[service_name] = session.create_client(service_name, config=client_config)
+        return clients[service_name]
 
 
 def get_cognito_user(id):
-    return cognito.admin_get_user(
+    return get_client('cognito-idp').admin_get_user(
         UserPoolId=USER_POOL_ID,
         Username=id
     )
@@ -205,7 +228,7 @@ def get_cognito_user_attribute(attribute_list, attribute_name):
 
 
 def update_user(id, args):
-    cognito.admin_update_user_attributes(
+    get_client('cognito-idp').admin_update_user_attributes(
         UserPoolId=USER_POOL_ID,
         Username=id,
         UserAttributes=[
@@ -219,73 +242,121 @@ def update_user(id, args):
             },
             {
                 'Name': 'custom:trial_start_date',
-                'Value': datetime.now(timezone.utc).isoformat()
+                'Value': args['trialStartDate']
             }
         ]
     )
 
 
-def save_to_db(user_id, prompt):
-    try:
-        existing_item = dynamodb.query(
-            TableName=STORY_TABLE,
-            KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-            ExpressionAttributeValues={
-                ':pk': {'S': f'USER#{user_id}'},
-                ':sk': {'S': 'STORY#'}
-            },
-            Limit=1
-        )
-        if len(existing_item['Items']):
-            logger.info(f'User {user_id} already has a story')
-            return
-    except Exception as e:
-        raise e
+def save_to_db(user_id, prompt, created_at):
+    # Stories saved before the key became deterministic live under STORY#<uuid>, which the
+    # put condition below can't see, so look for any existing story first
+    existing_item = get_client('dynamodb').query(
+        TableName=STORY_TABLE,
+        KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
+        ExpressionAttributeValues={
+            ':pk': {'S': f'USER#{user_id}'},
+            ':sk': {'S': 'STORY#'}
+        },
+        Limit=1
+    )
+    if len(existing_item['Items']):
+        logger.info(f'User {user_id} already has a story')
+        return
 
+    # The condition covers two deliveries of the same response racing past the check above
     try:
-        dynamodb.put_item(
+        get_client('dynamodb').put_item(
             TableName=STORY_TABLE,
             Item={
                 'PK': {'S': f'USER#{user_id}'},
-                'SK': {'S': f'STORY#{str(uuid.uuid4())}'},
+                'SK': {'S': f'STORY#{user_id}'},
                 'GSI1PK': {'S': f'USER#{user_id}'},
                 # Ensures this is the first item in the reversed sort
                 'GSI1SK': {'S': '9999'},
                 'entity': {'S': 'story'},
                 'userId': {'S': user_id},
-                'createdAt': {'S': str(datetime.now())},
+                'createdAt': {'S': created_at},
                 'prompt': {'S': prompt},
                 'chatRole': {'S': 'user'},
-            }
+            },
+            ConditionExpression='attribute_not_exists(PK)'
         )
-    except Exception as e:
-        raise e
+    except get_client('dynamodb').exceptions.ConditionalCheckFailedException:
+        logger.info(f'User {user_id} already has a story')
 
 
-def get_parameter(name):
+def fetch_parameter(name):
     try:
-        response = ssm.get_parameter(Name=name, WithDecryption=True)
+        response = get_client('ssm').get_parameter(Name=name, WithDecryption=True)
         return response['Parameter']['Value']
     except Exception as e:
-        error_message = f'Failed to get parameter {name}: {str(e)}'
-        send_error_to_slack(error_message)
+        # Logged only: error alerts go to the Slack URL stored in SSM, so alerting here could recurse
+        logger.error(f'Failed to get parameter {name}: {str(e)}')
         raise e
 
 
-def verify_signature(received_signature, payload):
+def prefetch_parameter(name):
+    # One shared fetch per parameter, reused across warm invocations. Failed fetches are started again.
+    with parameter_lock:
+        future = parameter_futures.get(name)
+        if future is None or (future.done() and future.exception() is not None):
+            future = parameter_futures[name] = executor.submit(fetch_parameter, name)
+        return future
+
+
+def get_parameter(name):
+    return prefetch_parameter(name).result()
+
+
+@lru_cache(maxsize=None)
+def get_webhook_secret():
+    return bytes(get_parameter('typeformSecret'), 'utf-8')
+
+
+def get_slack_webhook_url():
+    return get_parameter('slackWebhookUrl')
+
+
+def verify_signature(received_digest, payload_bytes):
     try:
-        WEBHOOK_SECRET = get_parameter('typeformSecret')
-        payload_bytes = bytes(payload, 'utf-8')
-        digest = hmac.new(bytes(WEBHOOK_SECRET, 'utf-8'),
-                          payload_bytes, hashlib.sha256).digest()
-        encoded = base64.b64encode(digest).decode()
+        digest = hmac.digest(get_webhook_secret(), payload_bytes, 'sha256')
 
-        return encoded == received_signature
+        return hmac.compare_digest(digest, received_digest)
     except Exception as e:
         logger.error(f'Failed to verify signature: {str(e)}')
         return False
 
 
+# Typeform field IDs for the answers used in the prompt, keyed by generate_prompt argument name
+FIELD_IDS = {
+    "birthdate": "VYsICm8rAEYx",
+    "height": "Ie0vINxRmbiE",
+    "weight": "U00Hv7HSJJE1",
+    "gender": "7NgJc6n3fYKa",
+    "fitness_goals": "EKEiaNAbhs9B",
+    "fitness_level": "dN0leyRXTKwb",
+    "exercise_frequency": "v3luF8GH8oTn",
+    "workout_duration": "4qftExcBXdrX",
+    "weightlifting_duration": "wORIrsd4ZVLR",
+    "number_of_exercises": "nY5mGGjAbXgZ",
+    "sets_reps": "VYFQXGfIQyAy",
+    "sets_reps_custom": "hLOuuzKYATVt",
+    "workout_location": "umri0ewHbWux",
+    "gym_name": "fStabAHHt7Hw",
+    "available_equipment": "9CnfCXmUgSXo",
+    "other_equipment": "F0T49AYX7sf2",
+    "current_cardio": "zYfBaTZMNkFI",
+    "include_cardio": "lKUgraPL2qDa",
+    "cardio_frequency": "ZRYPo085Loaz",
+    "cardio_length": "L5vTS0xxncEz",
+    "preferred_cardio_types": "qu9e790LtDZh",
+    "physical_injuries": "zp6cr5EGryS5",
+    "injury_details": "TDFLXROBWg4r",
+}
+
+FIELD_NAMES = {question_id: name for name, question_id in FIELD_IDS.items()}
+
 # List of field IDs to ignore from typeform
 ignore_field_ids = [
     "hyZIUMruIaXZ",
@@ -304,54 +375,50 @@ ignore_field_ids = [
 ]
 
 
-def get_question_id_to_title(data):
-    try:
-        question_id_to_title = {}
-        for field in data['fields']:
-            question_id_to_title[field['id']] = field['title']
-        return question_id_to_title
-    except Exception as e:
-        error_message = f'Failed to get question id to title: {str(e)}'
-        send_error_to_slack(error_message)
-        raise e
-
-
-def map_question_id_to_answer(data):
-    try:
-        question_id_to_answer = {}
-        for answer in data:
-            question_id = answer["field"]["id"]
-            if "text" in answer:
-                answer_value = answer["text"]
-            elif "email" in answer:
-                answer_value = answer["email"]
-            elif "phone_number" in answer:
-                answer_value = answer["phone_number"]
-            elif "date" in answer:
-                answer_value = answer["date"]
-            elif "choice" in answer:
-                answer_value = answer["choice"]["label"]
-            elif "choices" in answer:
-                choices = answer["choices"]
-                answer_value = ', '.join(
-                    choices["labels"]) if choices["labels"] else choices["other"]
-            elif "number" in answer:
-                answer_value = answer["number"]
-            elif "boolean" in answer:
-                answer_value = answer["boolean"]
-            elif "file" in answer:
-                answer_value = answer["file"]["url"]
-            elif "payment" in answer:
-                answer_value = str(answer["payment"]["successful"])
-            elif "url" in answer:
-                answer_value = answer["url"]
-            else:
-                answer_value = "Answer type not supported"
-            question_id_to_answer[question_id] = answer_value
-        return question_id_to_answer
-    except Exception as e:
-        log_and_alert(f'Failed to map question id to answer: {str(e)}')
-        raise e
+def get_question_ids(data):
+    return {field['id'] for field in data['fields']}
+
+
+# Value extractors for each typeform answer key, in the order the keys are checked
+ANSWER_EXTRACTORS = {
+    "text": lambda answer: answer["text"],
+    "email": lambda answer: answer["email"],
+    "phone_number": lambda answer: answer["phone_number"],
+    "date": lambda answer: answer["date"],
+    "choice": lambda answer: answer["choice"]["label"],
+    "choices": lambda answer: ', '.join(answer["choices"]["labels"]) if answer["choices"]["labels"]
+    else answer["choices"]["other"],
+    "number": lambda answer: answer["number"],
+    "boolean": lambda answer: answer["boolean"],
+    "file": lambda answer: answer["file"]["url"],
+    "payment": lambda answer: str(answer["payment"]["successful"]),
+    "url": lambda answer: answer["url"],
+}
+
+
+def get_answer_value(answer):
+    # Typeform names the value key in "type", so this is normally a single lookup
+    answer_key = answer.get("type")
+    if answer_key not in ANSWER_EXTRACTORS or answer_key not in answer:
+        answer_key = next((key for key in ANSWER_EXTRACTORS if key in answer), None)
+        if answer_key is None:
+            return "Answer type not supported"
+    return ANSWER_EXTRACTORS[answer_key](answer)
+
+
+def extract_answers(question_ids, form_answers):
+    # Questions skipped in the form read as "", questions missing from the form as "Not provided"
+    answers = {
+        name: "" if question_id in question_ids else "Not provided"
+        for name, question_id in FIELD_IDS.items()
+    }
+    # Single pass over the answers, extracting values only for the fields the prompt uses
+    for answer in form_answers:
+        question_id = answer["field"]["id"]
+        name = FIELD_NAMES.get(question_id)
+        if name is not None and question_id in question_ids:
+            answers[name] = get_answer_value(answer)
+    return answers
 
 
 def format_cardio_detail(first_name, current_cardio, include_cardio, cardio_frequency, cardio_length,
@@ -387,6 +454,18 @@ def format_sets_reps(sets_reps, sets_reps_custom):
         return sets_reps
 
 
+PROMPT_TEMPLATE = (
+    "Create a workout for {first_name} {last_name}, {age} years old, {gender}, fitness level: {fitness_level}, height: {height}, weight: {weight} lbs. "
+    "Fitness goals: {fitness_goals}. "
+    "Training frequency: {exercise_frequency} sessions/week, duration: {workout_duration} per session. "
+    "Each session includes {weightlifting_duration} of weightlifting with {number_of_exercises} performed in {formatted_sets_reps}. "
+    "{cardio_detail}"
+    "{environment_detail}"
+    "{injury_detail}"
+    "Based on {first_name}'s preferences, create a workout with a warm-up, main exercises, cardio (if included), and a cool-down."
+)
+
+
 def generate_prompt(first_name: str, last_name: str, age: int, gender: str, fitness_level: str, height: str,
                     weight: str, fitness_goals: str, exercise_frequency: str = None, workout_duration: str = None,
                     weightlifting_duration: str = None, number_of_exercises: str = None, sets_reps: str = None,
@@ -403,109 +482,112 @@ def generate_prompt(first_name: str, last_name: str, age: int, gender: str, fitn
 
     formatted_sets_reps = format_sets_reps(sets_reps, sets_reps_custom)
 
-    prompt = (
-        f"Create a workout for {first_name} {last_name}, {age} years old, {gender}, fitness level: {fitness_level}, height: {height}, weight: {weight} lbs. "
-        f"Fitness goals: {fitness_goals}. "
-        f"Training frequency: {exercise_frequency} sessions/week, duration: {workout_duration} per session. "
-        f"Each session includes {weightlifting_duration} of weightlifting with {number_of_exercises} performed in {formatted_sets_reps}. "
-        f"{cardio_detail}"
-        f"{environment_detail}"
-        f"{injury_detail}"
-        f"Based on {first_name}'s preferences, create a workout with a warm-up, main exercises, cardio (if included), and a cool-down."
+    return PROMPT_TEMPLATE.format(
+        first_name=first_name,
+        last_name=last_name,
+        age=age,
+        gender=gender,
+        fitness_level=fitness_level,
+        height=height,
+        weight=weight,
+        fitness_goals=fitness_goals,
+        exercise_frequency=exercise_frequency,
+        workout_duration=workout_duration,
+        weightlifting_duration=weightlifting_duration,
+        number_of_exercises=number_of_exercises,
+        formatted_sets_reps=formatted_sets_reps,
+        cardio_detail=cardio_detail,
+        environment_detail=environment_detail,
+        injury_detail=injury_detail
     )
 
-    return prompt
 
+def calculate_age(birthdate_str, today):
+    # Typeform dates are always YYYY-MM-DD, which fromisoformat parses without going through _strptime
+    birthdate = date.fromisoformat(birthdate_str)
+    age = today.year - birthdate.year - (
+        (today.month, today.day) < (birthdate.month, birthdate.day))
 
-def safe_get_answer(question_answer_pairs, question_id):
-    try:
-        answer_pair = question_answer_pairs.get(
-            question_id, {"answer": "Not provided"})
-        return answer_pair.get("answer", "Not provided")
-    except Exception as e:
-        error_message = f'Failed to get answer for question_id {question_id}: {str(e)}'
-        send_error_to_slack(error_message)
-        raise e
-
+    return age
 
-def calculate_age(birthdate_str):
-    try:
-        birthdate = datetime.strptime(birthdate_str, "%Y-%m-%d")
-        current_date = datetime.now()
-        age = current_date.year - birthdate.year - (
-            (current_date.month, current_date.day) < (birthdate.month, birthdate.day))
 
-        return age
-    except Exception as e:
-        error_message = f'Failed to calculate age for birthdate {birthdate_str}: {str(e)}'
-        send_error_to_slack(error_message)
-        raise e
+# Compiled once at import. The original emoji ranges (U+2600-U+2B55, U+1F1E0-U+1FAFF, etc.) all fall
+# inside U+24C2-U+10FFFF, so the class collapses to that span plus the few lower code points it listed.
+EMOJI_PATTERN = re.compile(
+    "["
+    "\u200d"
+    "\u231a"
+    "\u23cf"
+    "\u23e9"
+    "\u24c2-\U0010ffff"
+    "]+",
+    flags=re.UNICODE,
+)
 
 
 def remove_emojis(text):
-    try:
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F1E0-\U0001F1FF"
-            "\U0001F300-\U0001F5FF"
-            "\U0001F600-\U0001F64F"
-            "\U0001F680-\U0001F6FF"
-            "\U0001F700-\U0001F77F"
-            "\U0001F780-\U0001F7FF"
-            "\U0001F800-\U0001F8FF"
-            "\U0001F900-\U0001F9FF"
-            "\U0001FA00-\U0001FA6F"
-            "\U0001FA70-\U0001FAFF"
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "\U0001f926-\U0001f937"
-            "\U00010000-\U0010ffff"
-            "\u200d"
-            "\u2640-\u2642"
-            "\u2600-\u2B55"
-            "\u23cf"
-            "\u23e9"
-            "\u231a"
-            "\u3030"
-            "\ufe0f"
-            "]+",
-            flags=re.UNICODE,
-        )
-        return emoji_pattern.sub(r"", text)
-    except Exception as e:
-        log_and_alert(f"Failed to remove emojis from text: {str(e)}")
-        raise e
+    # Most prompts are plain ASCII; skip the regex scan entirely for those
+    if text.isascii():
+        return text
+    return EMOJI_PATTERN.sub(r"", text)
+
+
+def post_to_slack(url, text):
+    response = slack_session.post(
+        url,
+        json={'text': text},
+        timeout=SLACK_REQUEST_TIMEOUT
+    )
+    return response.status_code
+
+
+def submit_slack_post(url, text):
+    # Posts run in the background so they overlap the rest of the invocation
+    future = executor.submit(post_to_slack, url, text)
+    # Logged from the callback so a post that fails after the drain still leaves a trace
+    future.add_done_callback(log_slack_post_failure)
+    pending_slack_posts.append(future)
+    return future
+
+
+def log_slack_post_failure(future):
+    if future.exception():
+        logger.error(f'Failed to send message to Slack: {str(future.exception())}')
+
+
+def drain_slack_posts():
+    _, not_done = wait(pending_slack_posts, timeout=SLACK_DRAIN_TIMEOUT)
+    if not_done:
+        logger.warning(f'{len(not_done)} Slack message(s) still sending after {SLACK_DRAIN_TIMEOUT}s')
+    pending_slack_posts.clear()
 
 
 def send_to_slack(prompt):
-    try:
-        SLACK_WEBHOOK_URL = get_parameter('slackWebhookUrl')
+    SLACK_WEBHOOK_URL = get_slack_webhook_url()
 
-        # Constructing the formatted text for Slack
-        formatted_message = f'*Prompt*:\n> {prompt}'
+    # Constructing the formatted text for Slack
+    formatted_message = f'*Prompt*:\n> {prompt}'
 
-        response = requests.post(
-            SLACK_WEBHOOK_URL,
-            headers={'Content-type': 'application/json'},
-            data=json.dumps({
-                'text': formatted_message,
-            })
-        )
-        return response.status_code
-    except Exception as e:
-        error_message = f'Failed to send message to Slack: {str(e)}'
-        send_error_to_slack(error_message)
-        raise e
+    return submit_slack_post(SLACK_WEBHOOK_URL, formatted_message)
 
 
 def send_error_to_slack(error_message):
-    # Update this with your Slack Webhook URL
-    SLACK_WEBHOOK_URL = "YOUR_SLACK_WEBHOOK_URL_HERE"
-    response = requests.post(
-        SLACK_WEBHOOK_URL,
-        headers={'Content-type': 'application/json'},
-        data=json.dumps({
-            'text': error_message,
-        })
-    )
-    return response.status_code
+    try:
+        SLACK_WEBHOOK_URL = get_slack_webhook_url()
+    except Exception as e:
+        logger.error(f'Unable to send error to Slack: {str(e)}')
+        return None
+    return submit_slack_post(SLACK_WEBHOOK_URL, error_message)
+
+
+def send_errors_to_slack():
+    # One post per invocation, however many errors were logged
+    if pending_errors:
+        send_error_to_slack('\n'.join(pending_errors))
+        pending_errors.clear()
+
+
+# Start both SSM fetches during cold start so they overlap each other and the rest of init.
+# The handler blocks on them only when it first needs a value; a failed fetch is retried then.
+prefetch_parameter('typeformSecret')
+prefetch_parameter('slackWebhookUrl')